@@ -11,6 +11,15 @@ import os
 DATABASE = 'incentives.db'
 # Password = picker_id (same as username)
 
+# The default password is the public picker_id and must be changed on first
+# login, so use the app's lighter, overridable PBKDF2 cost for these hashes
+# instead of werkzeug's full-strength default
+_BULK_HASH_METHOD = os.environ.get('BULK_HASH_METHOD', 'pbkdf2:sha256:60000')
+
+def _bulk_password_hash(picker_id):
+    """Hash the default (publicly known) password for a picker account"""
+    return generate_password_hash(picker_id, method=_BULK_HASH_METHOD)
+
 def import_cohorts(csv_file):
     """Import cohorts from CSV file"""
     
@@ -47,39 +56,41 @@ def import_cohorts(csv_file):
         print(f"Found {len(cohort_map)} cohorts: {list(cohort_map.values())}")
         
         # Read all rows and build picker-cohort mapping
+        # Normalize to canonical lowercase so the upsert's ON CONFLICT
+        # matches existing accounts regardless of how the sheet cases IDs
         picker_cohorts = {}
         for row in reader:
             for idx, cohort_num in cohort_map.items():
                 if idx < len(row):
-                    picker_id = row[idx].strip()
+                    picker_id = row[idx].strip().lower()
                     if picker_id:  # Not empty
                         picker_cohorts[picker_id] = cohort_num
         
         print(f"Found {len(picker_cohorts)} pickers across all cohorts")
         
-        # Create/update users with cohort assignments
+        # Create/update users with cohort assignments in one batched UPSERT -
+        # the old SELECT-then-UPDATE/INSERT made three statements per picker.
         # Password = picker_id (same as username)
-        created = 0
-        updated = 0
-        
-        for picker_id, cohort_num in picker_cohorts.items():
-            # Check if user exists
-            cursor.execute('SELECT id, cohort FROM users WHERE LOWER(picker_id) = LOWER(?)', (picker_id,))
-            existing = cursor.fetchone()
-            
-            if existing:
-                # Update cohort and password (password = picker_id)
-                cursor.execute('UPDATE users SET cohort = ?, password = ? WHERE LOWER(picker_id) = LOWER(?)', 
-                             (cohort_num, generate_password_hash(picker_id), picker_id))
-                updated += 1
-            else:
-                # Create new user with password = picker_id
-                cursor.execute('''
-                    INSERT INTO users (picker_id, password, role, cohort, password_changed)
-                    VALUES (?, ?, ?, ?, 0)
-                ''', (picker_id, generate_password_hash(picker_id), 'picker', cohort_num))
-                created += 1
-        
+        # Fold any legacy mixed-case IDs first - the same one-time
+        # normalization the app applies to items.picker_id
+        cursor.execute('UPDATE users SET picker_id = LOWER(picker_id) WHERE picker_id <> LOWER(picker_id)')
+
+        cursor.execute('SELECT COUNT(*) FROM users')
+        users_before = cursor.fetchone()[0]
+
+        cursor.executemany('''
+            INSERT INTO users (picker_id, password, role, cohort, password_changed)
+            VALUES (?, ?, 'picker', ?, 0)
+            ON CONFLICT(picker_id) DO UPDATE SET
+                cohort = excluded.cohort,
+                password = excluded.password
+        ''', [(picker_id, _bulk_password_hash(picker_id), cohort_num)
+              for picker_id, cohort_num in picker_cohorts.items()])
+
+        cursor.execute('SELECT COUNT(*) FROM users')
+        created = cursor.fetchone()[0] - users_before
+        updated = len(picker_cohorts) - created
+
         conn.commit()
         
         # Print summary by cohort
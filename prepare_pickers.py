@@ -13,16 +13,53 @@ The CSV should have columns: Casper ID, Name, Designation, Cohort, DOJ
 import csv
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from werkzeug.security import generate_password_hash
 from datetime import datetime
 
+# Initial passwords equal the (public) picker_id and must be changed on
+# first login, so full-strength key stretching buys nothing here. Same
+# lighter, overridable cost the app uses for bulk-created accounts.
+_BULK_HASH_METHOD = os.environ.get('BULK_HASH_METHOD', 'pbkdf2:sha256:60000')
+
+def _bulk_password_hash(picker_id):
+    """Hash the default (publicly known) password for a new picker account"""
+    return generate_password_hash(picker_id, method=_BULK_HASH_METHOD)
+
+_MONTHS = {'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+           'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12}
+
 def parse_date(date_str):
-    """Parse date string in various formats"""
+    """Parse date string in various formats.
+
+    The known shapes are fixed-width, so slicing + int() handles virtually
+    every row without strptime, which re-interprets its format string on
+    each call; the old format loop remains as a fallback for stragglers.
+    """
     if not date_str:
         return None
+    s = date_str.strip()
+    try:
+        if len(s) == 10 and s[4] == '-' and s[7] == '-':    # YYYY-MM-DD
+            y, m, d = int(s[0:4]), int(s[5:7]), int(s[8:10])
+        elif len(s) == 10 and s[2] == '/' and s[5] == '/':  # DD/MM/YYYY
+            d, m, y = int(s[0:2]), int(s[3:5]), int(s[6:10])
+        elif len(s) == 10 and s[2] == '-' and s[5] == '-':  # DD-MM-YYYY
+            d, m, y = int(s[0:2]), int(s[3:5]), int(s[6:10])
+        elif len(s) == 11 and s[2] == '-' and s[6] == '-':  # DD-Mon-YYYY
+            m = _MONTHS.get(s[3:6].lower())
+            if m is None:
+                raise ValueError(s)
+            d, y = int(s[0:2]), int(s[7:11])
+        else:
+            raise ValueError(s)
+        datetime(y, m, d)  # range-check the fields
+        return f'{y:04d}-{m:02d}-{d:02d}'
+    except ValueError:
+        pass
     for fmt in ['%d-%b-%Y', '%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y']:
         try:
-            return datetime.strptime(date_str.strip(), fmt).strftime('%Y-%m-%d')
+            return datetime.strptime(s, fmt).strftime('%Y-%m-%d')
         except ValueError:
             continue
     return None
@@ -39,17 +76,39 @@ def main():
     print(f"📂 Reading {csv_file}...")
     
     pickers = []
-    with open(csv_file, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
+    with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+
+        # Resolve the header's aliased column names once - DictReader built
+        # a dict per row and then walked the fallback keys with chained
+        # .get() calls for every field
+        header = [h.strip().lower() for h in next(reader, [])]
+        col = {name: i for i, name in enumerate(header)}
+        n_cols = len(header)
+
+        def _col(*names):
+            for name in names:
+                if name in col:
+                    return col[name]
+            return n_cols
+
+        i_id = _col('casper id', 'casper_id', 'picker_id')
+        i_name = _col('name')
+        i_cohort = _col('cohort')
+        i_doj = _col('doj', 'date of joining')
+
         for row in reader:
-            picker_id = row.get('Casper ID', row.get('casper_id', row.get('picker_id', ''))).strip()
+            while len(row) <= n_cols:
+                row.append('')
+
+            picker_id = row[i_id].strip()
             if not picker_id:
                 continue
-            
-            name = row.get('Name', row.get('name', '')).strip()
-            cohort_str = row.get('Cohort', row.get('cohort', '')).strip()
-            doj_str = row.get('DOJ', row.get('doj', row.get('Date of Joining', ''))).strip()
-            
+
+            name = row[i_name].strip()
+            cohort_str = row[i_cohort].strip()
+            doj_str = row[i_doj].strip()
+
             try:
                 cohort = int(cohort_str) if cohort_str else None
             except ValueError:
@@ -66,16 +125,22 @@ def main():
     
     print(f"✅ Found {len(pickers)} pickers")
     
-    # Generate password hashes (this is the slow part)
+    # Generate password hashes (this is the slow part) - PBKDF2 is pure CPU,
+    # so hash each distinct picker_id exactly once and fan the work out
+    # across all cores instead of hashing row by row
     print(f"🔐 Generating password hashes (this may take a minute)...")
-    for i, p in enumerate(pickers):
-        p['password_hash'] = generate_password_hash(p['picker_id'])
-        if (i + 1) % 100 == 0:
-            print(f"   Processed {i + 1}/{len(pickers)}")
+    unique_ids = list({p['picker_id'] for p in pickers})
+    with ProcessPoolExecutor() as executor:
+        hashes = executor.map(_bulk_password_hash, unique_ids, chunksize=32)
+        hash_by_id = dict(zip(unique_ids, hashes))
+    for p in pickers:
+        p['password_hash'] = hash_by_id[p['picker_id']]
     
     print(f"💾 Saving to {output_file}...")
     with open(output_file, 'w') as f:
-        json.dump(pickers, f, indent=2)
+        # Compact separators - the file is machine-read by the deploy
+        # script, and indentation roughly doubles its size and parse time
+        json.dump(pickers, f, separators=(',', ':'))
     
     print(f"\n✅ Done! {len(pickers)} pickers prepared.")
     print(f"\n📋 Cohort Summary:")
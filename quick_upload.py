@@ -22,12 +22,40 @@ except ImportError:
     print("❌ psycopg2 not installed. Run: pip3 install psycopg2-binary")
     sys.exit(1)
 
+# Default passwords (the picker_id itself, or 'picker123') are public and
+# forced to change on first login, so hash them with the app's lighter,
+# overridable PBKDF2 cost instead of werkzeug's full-strength default
+_BULK_HASH_METHOD = os.environ.get('BULK_HASH_METHOD', 'pbkdf2:sha256:60000')
+
+# Keep in sync with app._STATUS_CODES - the dashboards aggregate on the
+# integer code, so rows loaded without one are invisible to the counts
+STATUS_CODES = {'COMPLETED': 1, 'ITEM_REPLACED': 2, 'ITEM_NOT_FOUND': 3}
+
+def _bulk_password_hash(password):
+    """Hash a default (publicly known) password for a picker account"""
+    return generate_password_hash(password, method=_BULK_HASH_METHOD)
+
+def _parse_ts(s):
+    """Fast path for the ingest timestamp format 'YYYY-MM-DD HH:MM:SS'
+    (with or without fractional seconds) - the fields are fixed-width, so
+    slicing beats strptime by an order of magnitude on big CSVs. Returns
+    None if the string doesn't fit the shape."""
+    if len(s) < 19 or s[4] != '-' or s[7] != '-' or s[13] != ':' or s[16] != ':':
+        return None
+    try:
+        return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                        int(s[11:13]), int(s[14:16]), int(s[17:19]))
+    except ValueError:
+        return None
+
 def connect_db(url):
     """Connect to PostgreSQL"""
     if url.startswith('postgres://'):
         url = url.replace('postgres://', 'postgresql://', 1)
     print(f"🔗 Connecting to PostgreSQL...")
-    conn = psycopg2.connect(url, cursor_factory=RealDictCursor)
+    # Plain tuple cursors - dict-per-row only where named fields help
+    # (show_stats opts in)
+    conn = psycopg2.connect(url)
     print("✅ Connected!")
     return conn
 
@@ -37,7 +65,7 @@ def upload_cohorts(conn, csv_path):
     
     cursor = conn.cursor()
     
-    with open(csv_path, 'r', encoding='utf-8') as f:
+    with open(csv_path, 'r', encoding='utf-8', buffering=1 << 20, newline='') as f:
         reader = csv.reader(f)
         header = next(reader)
         
@@ -53,38 +81,41 @@ def upload_cohorts(conn, csv_path):
         
         print(f"   Found {len(cohort_map)} cohorts: {list(cohort_map.values())}")
         
-        # Build picker-cohort mapping
+        # Build picker-cohort mapping, normalized to canonical lowercase so
+        # the upsert's ON CONFLICT matches existing accounts regardless of
+        # how the sheet cases IDs
         picker_cohorts = {}
         for row in reader:
             for idx, cohort_num in cohort_map.items():
                 if idx < len(row):
-                    picker_id = row[idx].strip()
+                    picker_id = row[idx].strip().lower()
                     if picker_id:
                         picker_cohorts[picker_id] = cohort_num
         
         print(f"   Total pickers: {len(picker_cohorts)}")
         
-        # Upsert users
-        created = 0
-        updated = 0
-        
-        for picker_id, cohort_num in picker_cohorts.items():
-            cursor.execute('SELECT id FROM users WHERE LOWER(picker_id) = LOWER(%s)', (picker_id,))
-            existing = cursor.fetchone()
-            
-            if existing:
-                cursor.execute(
-                    'UPDATE users SET cohort = %s, password = %s WHERE LOWER(picker_id) = LOWER(%s)',
-                    (cohort_num, generate_password_hash(picker_id), picker_id)
-                )
-                updated += 1
-            else:
-                cursor.execute('''
-                    INSERT INTO users (picker_id, password, role, cohort, password_changed)
-                    VALUES (%s, %s, %s, %s, 0)
-                ''', (picker_id, generate_password_hash(picker_id), 'picker', cohort_num))
-                created += 1
-        
+        # Upsert users in one batched statement - the old SELECT-then-
+        # UPDATE/INSERT made up to three round trips per picker
+        # Fold any legacy mixed-case IDs first - the same one-time
+        # normalization the app applies to items.picker_id
+        cursor.execute('UPDATE users SET picker_id = LOWER(picker_id) WHERE picker_id <> LOWER(picker_id)')
+
+        cursor.execute('SELECT COUNT(*) FROM users')
+        users_before = cursor.fetchone()[0]
+
+        execute_values(cursor, '''
+            INSERT INTO users (picker_id, password, role, cohort, password_changed)
+            VALUES %s
+            ON CONFLICT (picker_id) DO UPDATE SET
+                cohort = EXCLUDED.cohort,
+                password = EXCLUDED.password
+        ''', [(picker_id, _bulk_password_hash(picker_id), 'picker', cohort_num, 0)
+              for picker_id, cohort_num in picker_cohorts.items()])
+
+        cursor.execute('SELECT COUNT(*) FROM users')
+        created = cursor.fetchone()[0] - users_before
+        updated = len(picker_cohorts) - created
+
         conn.commit()
         print(f"✅ Cohorts uploaded! Created: {created}, Updated: {updated}")
 
@@ -93,70 +124,92 @@ def upload_data(conn, csv_path):
     print(f"\n📤 Uploading data from: {csv_path}")
     
     cursor = conn.cursor()
-    
-    # Count rows first
-    with open(csv_path, 'r', encoding='utf-8', errors='replace') as f:
-        total_rows = sum(1 for _ in f) - 1  # minus header
-    print(f"   Total rows to process: {total_rows:,}")
-    
-    with open(csv_path, 'r', encoding='utf-8', errors='replace') as f:
-        reader = csv.DictReader(f)
-        
+
+    # Progress comes from bytes consumed against the file size - counting
+    # lines up front meant reading the whole file twice
+    file_size = os.path.getsize(csv_path)
+
+    # 1MB read buffer - the default 8KB means a read() syscall every few
+    # hundred rows on multi-million-row files
+    with open(csv_path, 'r', encoding='utf-8', errors='replace', buffering=1 << 20, newline='') as f:
+        reader = csv.reader(f)
+
+        # Resolve column positions from the header once instead of letting
+        # DictReader build and hash a dict for every row. A missing column
+        # maps just past the row end; rows are padded to n_cols + 1 so that
+        # index reads '' - same as DictReader's .get(name, '') default.
+        header = next(reader, [])
+        col = {name.strip(): i for i, name in enumerate(header)}
+        n_cols = len(header)
+        i_warehouse = col.get('source_warehouse', n_cols)
+        i_picker = col.get('picker_ldap', n_cols)
+        i_status = col.get('item_status', n_cols)
+        i_dispatch = col.get('dispatch_by_date', n_cols)
+        i_picklist = col.get('external_picklist_id', n_cols)
+        i_bin = col.get('location_bin_id', n_cols)
+        i_seq = col.get('location_sequence', n_cols)
+        i_updated = col.get('updated_at', n_cols)
+
+        csv_file = os.path.basename(csv_path)
         batch = []
         pickers_seen = set()
         rows_inserted = 0
         BATCH_SIZE = 1000
-        
+
         for row in reader:
-            updated_at_str = row.get('updated_at', '').strip()
+            while len(row) <= n_cols:
+                row.append('')
+
+            updated_at_str = row[i_updated].strip()
             if not updated_at_str:
                 continue
-            
-            try:
-                updated_at = datetime.strptime(updated_at_str, '%Y-%m-%d %H:%M:%S')
-            except ValueError:
-                try:
-                    updated_at = datetime.strptime(updated_at_str, '%Y-%m-%d %H:%M:%S.%f')
-                except ValueError:
-                    continue
-            
-            picker_id = row.get('picker_ldap', '').strip()
+
+            updated_at = _parse_ts(updated_at_str)
+            if updated_at is None:
+                continue
+
+            # Canonical lowercase, matching the app's and csv_processor's ingest
+            picker_id = row[i_picker].strip().lower()
             if not picker_id:
                 continue
-            
+
+            item_status = row[i_status]
             batch.append((
-                row.get('source_warehouse', ''),
+                row[i_warehouse],
                 picker_id,
-                row.get('item_status', ''),
-                row.get('dispatch_by_date', ''),
-                row.get('external_picklist_id', ''),
-                row.get('location_bin_id', ''),
-                row.get('location_sequence', ''),
+                item_status,
+                STATUS_CODES.get(item_status, 0),
+                row[i_dispatch],
+                row[i_picklist],
+                row[i_bin],
+                row[i_seq],
                 updated_at.strftime('%Y-%m-%d %H:%M:%S'),
-                os.path.basename(csv_path)
+                csv_file
             ))
             pickers_seen.add(picker_id)
             
             if len(batch) >= BATCH_SIZE:
                 execute_values(cursor, '''
                     INSERT INTO items (
-                        source_warehouse, picker_id, item_status, dispatch_by_date,
-                        external_picklist_id, location_bin_id, location_sequence,
-                        updated_at, csv_file
+                        source_warehouse, picker_id, item_status, item_status_code,
+                        dispatch_by_date, external_picklist_id, location_bin_id,
+                        location_sequence, updated_at, csv_file
                     ) VALUES %s
                 ''', batch)
                 conn.commit()
                 rows_inserted += len(batch)
-                print(f"   Progress: {rows_inserted:,} / {total_rows:,} ({rows_inserted*100//total_rows}%)")
+                # f.buffer.tell() reads the raw byte position - text-mode
+                # tell() is disabled while the csv reader iterates
+                print(f"   Progress: {rows_inserted:,} rows ({f.buffer.tell()*100//file_size}%)")
                 batch = []
         
         # Insert remaining
         if batch:
             execute_values(cursor, '''
                 INSERT INTO items (
-                    source_warehouse, picker_id, item_status, dispatch_by_date,
-                    external_picklist_id, location_bin_id, location_sequence,
-                    updated_at, csv_file
+                    source_warehouse, picker_id, item_status, item_status_code,
+                    dispatch_by_date, external_picklist_id, location_bin_id,
+                    location_sequence, updated_at, csv_file
                 ) VALUES %s
             ''', batch)
             conn.commit()
@@ -164,16 +217,20 @@ def upload_data(conn, csv_path):
         
         print(f"✅ Data uploaded! {rows_inserted:,} rows inserted")
         
-        # Create picker accounts for new pickers
-        default_password = generate_password_hash('picker123')
-        pickers_added = 0
-        for picker_id in pickers_seen:
-            cursor.execute('''
-                INSERT INTO users (picker_id, password, role, password_changed)
-                VALUES (%s, %s, %s, 0)
-                ON CONFLICT (picker_id) DO NOTHING
-            ''', (picker_id, default_password, 'picker'))
-            pickers_added += cursor.rowcount
+        # Create picker accounts for new pickers in one batched insert
+        # instead of a round trip per distinct picker
+        default_password = _bulk_password_hash('picker123')
+        cursor.execute('SELECT COUNT(*) FROM users')
+        users_before = cursor.fetchone()[0]
+
+        execute_values(cursor, '''
+            INSERT INTO users (picker_id, password, role, password_changed)
+            VALUES %s
+            ON CONFLICT (picker_id) DO NOTHING
+        ''', [(picker_id, default_password, 'picker', 0) for picker_id in pickers_seen])
+
+        cursor.execute('SELECT COUNT(*) FROM users')
+        pickers_added = cursor.fetchone()[0] - users_before
         conn.commit()
         
         if pickers_added > 0:
@@ -189,7 +246,7 @@ def upload_data(conn, csv_path):
 
 def show_stats(conn):
     """Show database stats"""
-    cursor = conn.cursor()
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
     
     cursor.execute('SELECT COUNT(*) as count FROM items')
     total_items = cursor.fetchone()['count']
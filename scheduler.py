@@ -4,9 +4,10 @@ Run this script in the background to continuously process CSV files
 """
 
 import time
-import schedule
 from csv_processor import process_new_csvs
 
+INTERVAL_SECONDS = 10 * 60
+
 def job():
     """Job to process CSV files"""
     print(f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] Running CSV processor...")
@@ -17,18 +18,12 @@ if __name__ == '__main__':
     print("CSV Processor Scheduler Started")
     print("Processing CSV files every 10 minutes...")
     print("Press Ctrl+C to stop\n")
-    
-    # Schedule job every 10 minutes
-    schedule.every(10).minutes.do(job)
-    
-    # Run immediately on start
-    job()
-    
-    # Keep running
+
+    # One sleep per interval - no third-party scheduler, no per-minute
+    # wakeups just to discover nothing is due
     try:
         while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            job()
+            time.sleep(INTERVAL_SECONDS)
     except KeyboardInterrupt:
         print("\nScheduler stopped by user")
-
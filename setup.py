@@ -43,6 +43,22 @@ else:
 
 DATABASE = 'incentives.db'
 
+def configure_sqlite(conn):
+    """Apply the same tuned pragmas the app and csv_processor use.
+
+    WAL turns the two fsyncs of rollback-journal commits into one
+    sequential append and keeps readers unblocked while the scheduler
+    writes; journal_mode sticks in the file header, so setting it here
+    covers every later connection too.
+    """
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-64000')
+    # Bound WAL growth under the write-heavy ingest cron
+    conn.execute('PRAGMA wal_autocheckpoint=1000')
+    return conn
+
 def get_db():
     """Get database connection"""
     if USE_POSTGRES:
@@ -51,7 +67,7 @@ def get_db():
     else:
         conn = sqlite3.connect(DATABASE)
         conn.row_factory = sqlite3.Row
-        return conn
+        return configure_sqlite(conn)
 
 def execute_query(cursor, query, params=None):
     """Execute query with proper parameter placeholder"""
@@ -62,9 +78,11 @@ def execute_query(cursor, query, params=None):
     else:
         cursor.execute(query)
 
-def init_database():
-    """Initialize database"""
-    conn = get_db()
+def init_schema(conn=None):
+    """Create tables (and run column migrations) without any indexes"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db()
     cursor = conn.cursor()
     
     if USE_POSTGRES:
@@ -96,6 +114,7 @@ def init_database():
                 source_warehouse TEXT,
                 picker_id TEXT,
                 item_status TEXT,
+                item_status_code INTEGER,
                 dispatch_by_date TIMESTAMP,
                 external_picklist_id TEXT,
                 location_bin_id TEXT,
@@ -113,13 +132,58 @@ def init_database():
                 processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
-        # Create indexes for better performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_items_picker_id ON items(picker_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_items_updated_at ON items(updated_at)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_items_picker_updated ON items(picker_id, updated_at)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_cohort ON users(cohort)')
-        
+
+        # Per-day aggregate cache read by the long-range leaderboards and
+        # rebuilt after each CSV ingest
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS items_daily_rollup (
+                day DATE,
+                picker_id TEXT,
+                items_picked INTEGER,
+                items_lost INTEGER,
+                unique_picklists INTEGER,
+                PRIMARY KEY (day, picker_id)
+            )
+        ''')
+
+        # The app's hot aggregations compare this small int instead of the
+        # status string; existing databases get the column plus a one-time
+        # backfill (the deploy entry points only ever run this script, so
+        # the migration has to live here, not just in app.init_db)
+        cursor.execute("ALTER TABLE items ADD COLUMN IF NOT EXISTS item_status_code INTEGER")
+        cursor.execute('''
+            UPDATE items SET item_status_code = CASE item_status
+                WHEN 'COMPLETED' THEN 1
+                WHEN 'ITEM_REPLACED' THEN 2
+                WHEN 'ITEM_NOT_FOUND' THEN 3
+                ELSE 0 END
+            WHERE item_status_code IS NULL
+        ''')
+
+        # The app stores and matches items.picker_id in canonical lowercase
+        # (no per-row LOWER() in the hot queries), so legacy mixed-case
+        # rows must be folded here on the deploy path too
+        cursor.execute("UPDATE items SET picker_id = LOWER(picker_id) WHERE picker_id <> LOWER(picker_id)")
+
+        # Seed a freshly-created (empty) rollup from items: the app's
+        # long-range leaderboards read it unconditionally, so without this
+        # a deploy onto an existing database shows only today's raw delta
+        # until the next CSV ingest rebuilds it. Must run after the
+        # status-code backfill above. Keep the SUMs in sync with
+        # app._PICKED_AGG / app._LOST_AGG.
+        cursor.execute('SELECT 1 FROM items_daily_rollup LIMIT 1')
+        if cursor.fetchone() is None:
+            cursor.execute('''
+                INSERT INTO items_daily_rollup (day, picker_id, items_picked, items_lost, unique_picklists)
+                SELECT CAST(updated_at AS DATE), picker_id,
+                       COALESCE(SUM((item_status_code IN (1, 2))::int), 0),
+                       COALESCE(SUM((item_status_code = 3)::int), 0),
+                       COUNT(DISTINCT external_picklist_id)
+                FROM items
+                WHERE updated_at < CURRENT_DATE
+                GROUP BY CAST(updated_at AS DATE), picker_id
+            ''')
+
     else:
         # SQLite schema
         cursor.execute('''
@@ -136,26 +200,18 @@ def init_database():
             )
         ''')
         
-        # Add columns if they don't exist (for existing databases)
-        try:
-            cursor.execute('ALTER TABLE users ADD COLUMN password_changed INTEGER DEFAULT 0')
-        except:
-            pass
-        
-        try:
-            cursor.execute('ALTER TABLE users ADD COLUMN cohort INTEGER DEFAULT NULL')
-        except:
-            pass
-        
-        try:
-            cursor.execute('ALTER TABLE users ADD COLUMN name TEXT')
-        except:
-            pass
-        
-        try:
-            cursor.execute('ALTER TABLE users ADD COLUMN doj TEXT')
-        except:
-            pass
+        # Add columns if they don't exist (for existing databases) - one
+        # PRAGMA read instead of four fire-and-swallow ALTER attempts, so
+        # real schema failures surface instead of being silenced
+        user_cols = {row['name'] for row in cursor.execute('PRAGMA table_info(users)')}
+        for col, decl in (
+            ('password_changed', 'INTEGER DEFAULT 0'),
+            ('cohort', 'INTEGER DEFAULT NULL'),
+            ('name', 'TEXT'),
+            ('doj', 'TEXT'),
+        ):
+            if col not in user_cols:
+                cursor.execute(f'ALTER TABLE users ADD COLUMN {col} {decl}')
         
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS items (
@@ -163,6 +219,7 @@ def init_database():
                 source_warehouse TEXT,
                 picker_id TEXT,
                 item_status TEXT,
+                item_status_code INTEGER,
                 dispatch_by_date TIMESTAMP,
                 external_picklist_id TEXT,
                 location_bin_id TEXT,
@@ -180,60 +237,185 @@ def init_database():
                 processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-    
+
+        # Per-day aggregate cache read by the long-range leaderboards and
+        # rebuilt after each CSV ingest
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS items_daily_rollup (
+                day DATE,
+                picker_id TEXT,
+                items_picked INTEGER,
+                items_lost INTEGER,
+                unique_picklists INTEGER,
+                PRIMARY KEY (day, picker_id)
+            )
+        ''')
+
+        # Same status-code migration as the Postgres branch - local
+        # databases made by this script alone must match what app.py and
+        # csv_processor.py insert and aggregate on
+        item_cols = {row['name'] for row in cursor.execute('PRAGMA table_info(items)')}
+        if 'item_status_code' not in item_cols:
+            cursor.execute('ALTER TABLE items ADD COLUMN item_status_code INTEGER')
+        cursor.execute('''
+            UPDATE items SET item_status_code = CASE item_status
+                WHEN 'COMPLETED' THEN 1
+                WHEN 'ITEM_REPLACED' THEN 2
+                WHEN 'ITEM_NOT_FOUND' THEN 3
+                ELSE 0 END
+            WHERE item_status_code IS NULL
+        ''')
+
+        # The app stores and matches items.picker_id in canonical lowercase
+        # (no per-row LOWER() in the hot queries), so legacy mixed-case
+        # rows must be folded here on the deploy path too
+        cursor.execute("UPDATE items SET picker_id = LOWER(picker_id) WHERE picker_id <> LOWER(picker_id)")
+
+        # Seed a freshly-created (empty) rollup - same reason as the
+        # Postgres branch
+        cursor.execute('SELECT 1 FROM items_daily_rollup LIMIT 1')
+        if cursor.fetchone() is None:
+            cursor.execute('''
+                INSERT INTO items_daily_rollup (day, picker_id, items_picked, items_lost, unique_picklists)
+                SELECT DATE(updated_at), picker_id,
+                       COALESCE(SUM(item_status_code IN (1, 2)), 0),
+                       COALESCE(SUM(item_status_code = 3), 0),
+                       COUNT(DISTINCT external_picklist_id)
+                FROM items
+                WHERE updated_at < DATE('now', 'localtime')
+                GROUP BY DATE(updated_at), picker_id
+            ''')
+
     conn.commit()
-    conn.close()
-    print(f"✅ Database initialized ({'PostgreSQL' if USE_POSTGRES else 'SQLite'})")
+    if own_conn:
+        conn.close()
+    print(f"✅ Schema initialized ({'PostgreSQL' if USE_POSTGRES else 'SQLite'})")
 
-def create_sample_users():
-    """Create admin and supervisor users"""
-    conn = get_db()
+def create_indexes(conn=None):
+    """Create all secondary indexes.
+
+    Kept separate from init_schema so deploys can bulk-load first and
+    build each index with one sort instead of maintaining b-trees per
+    inserted row.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db()
     cursor = conn.cursor()
-    
-    # Supervisor user
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_items_picker_id ON items(picker_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_items_updated_at ON items(updated_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_items_picker_updated ON items(picker_id, updated_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_cohort ON users(cohort)')
+    conn.commit()
+
+    # The app and deploy scripts look users up by LOWER(picker_id);
+    # without this functional index every probe is a sequential scan,
+    # and UNIQUE enforces one account per ID regardless of case. Fold
+    # legacy mixed-case IDs first so the upsert routes' exact-case
+    # conflict target matches existing accounts.
     try:
-        if USE_POSTGRES:
-            cursor.execute('''
-                INSERT INTO users (picker_id, password, role, password_changed)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (picker_id) DO NOTHING
-            ''', ('supervisor', generate_password_hash('supervisor123'), 'supervisor', 0))
-        else:
-            cursor.execute('''
-                INSERT OR IGNORE INTO users (picker_id, password, role, password_changed)
-                VALUES (?, ?, ?, ?)
-            ''', ('supervisor', generate_password_hash('supervisor123'), 'supervisor', 0))
-        print("✅ Created supervisor user: supervisor")
+        cursor.execute('UPDATE users SET picker_id = LOWER(picker_id) WHERE picker_id <> LOWER(picker_id)')
+        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_users_picker_lower ON users (LOWER(picker_id))')
+        conn.commit()
     except Exception as e:
-        print(f"  Supervisor user: {e}")
-    
-    # Admin user (for data upload)
-    admin_password = os.environ.get('ADMIN_PASSWORD', 'admin@warehouse2024')
+        # Two accounts differing only in case block both the fold and
+        # the unique index - leave them for manual cleanup
+        print(f"  ⚠️ Could not normalize users or create idx_users_picker_lower: {e}")
+        conn.rollback()
+
+    if own_conn:
+        conn.close()
+    print("✅ Indexes created")
+
+def init_database():
+    """Initialize database (schema + indexes)"""
+    conn = get_db()
     try:
-        if USE_POSTGRES:
-            cursor.execute('''
-                INSERT INTO users (picker_id, password, role, password_changed)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (picker_id) DO NOTHING
-            ''', ('admin', generate_password_hash(admin_password), 'admin', 1))
-        else:
-            cursor.execute('''
-                INSERT OR IGNORE INTO users (picker_id, password, role, password_changed)
-                VALUES (?, ?, ?, ?)
-            ''', ('admin', generate_password_hash(admin_password), 'admin', 1))
-        print("✅ Created admin user: admin")
-    except Exception as e:
-        print(f"  Admin user: {e}")
-    
+        init_schema(conn)
+        create_indexes(conn)
+    finally:
+        conn.close()
+
+def create_sample_users(conn=None):
+    """Create admin and supervisor users"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db()
+    cursor = conn.cursor()
+
+    # Only hash for accounts that are actually missing - the conflict-
+    # ignoring insert discards the hash otherwise, so every redeploy was
+    # burning two full PBKDF2 rounds for nothing
+    execute_query(cursor, "SELECT picker_id FROM users WHERE picker_id IN ('supervisor', 'admin')")
+    existing = {row['picker_id'] for row in cursor.fetchall()}
+
+    # Supervisor user
+    if 'supervisor' in existing:
+        print("✅ Supervisor user already exists")
+    else:
+        try:
+            if USE_POSTGRES:
+                cursor.execute('''
+                    INSERT INTO users (picker_id, password, role, password_changed)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (picker_id) DO NOTHING
+                ''', ('supervisor', generate_password_hash('supervisor123'), 'supervisor', 0))
+            else:
+                cursor.execute('''
+                    INSERT OR IGNORE INTO users (picker_id, password, role, password_changed)
+                    VALUES (?, ?, ?, ?)
+                ''', ('supervisor', generate_password_hash('supervisor123'), 'supervisor', 0))
+            print("✅ Created supervisor user: supervisor")
+        except Exception as e:
+            print(f"  Supervisor user: {e}")
+
+    # Admin user (for data upload)
+    if 'admin' in existing:
+        print("✅ Admin user already exists")
+    else:
+        admin_password = os.environ.get('ADMIN_PASSWORD', 'admin@warehouse2024')
+        try:
+            if USE_POSTGRES:
+                cursor.execute('''
+                    INSERT INTO users (picker_id, password, role, password_changed)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (picker_id) DO NOTHING
+                ''', ('admin', generate_password_hash(admin_password), 'admin', 1))
+            else:
+                cursor.execute('''
+                    INSERT OR IGNORE INTO users (picker_id, password, role, password_changed)
+                    VALUES (?, ?, ?, ?)
+                ''', ('admin', generate_password_hash(admin_password), 'admin', 1))
+            print("✅ Created admin user: admin")
+        except Exception as e:
+            print(f"  Admin user: {e}")
+
     conn.commit()
-    conn.close()
+    if own_conn:
+        conn.close()
     print("✅ Sample users created")
 
 if __name__ == '__main__':
+    if '--indexes-only' in sys.argv:
+        # Deploy hook: build indexes after the bulk uploads have run
+        create_indexes()
+        sys.exit(0)
+
     print("🚀 Setting up database...")
     print(f"   Mode: {'PostgreSQL (Production)' if USE_POSTGRES else 'SQLite (Local)'}")
-    init_database()
-    create_sample_users()
+    # One connection for the whole pass - each step used to open, commit
+    # and tear down its own
+    conn = get_db()
+    try:
+        init_schema(conn)
+        create_sample_users(conn)
+        if '--schema-only' in sys.argv:
+            print("⏭️  Index creation deferred (run 'python setup.py --indexes-only' after the bulk load)")
+        else:
+            create_indexes(conn)
+    finally:
+        conn.close()
     print("\n✅ Setup complete!")
     print("\n📋 Login Credentials:")
     print("=" * 50)
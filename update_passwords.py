@@ -3,32 +3,51 @@ Script to update all picker passwords to match their picker_id.
 Password = picker_id (same case)
 """
 
+import os
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from werkzeug.security import generate_password_hash
 
 DATABASE = 'incentives.db'
 
+# The reset password is the public picker_id with password_changed=0, so
+# use the app's lighter, overridable PBKDF2 cost for these hashes
+_BULK_HASH_METHOD = os.environ.get('BULK_HASH_METHOD', 'pbkdf2:sha256:60000')
+
+def _bulk_password_hash(picker_id):
+    """Hash the default (publicly known) password for a picker account"""
+    return generate_password_hash(picker_id, method=_BULK_HASH_METHOD)
+
 def update_passwords():
     """Update all picker passwords to match their picker_id"""
     conn = sqlite3.connect(DATABASE)
+    # Same tuned pragmas the app uses - WAL halves commit fsyncs and keeps
+    # dashboard readers unblocked while passwords rewrite
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
     cursor = conn.cursor()
-    
+
     # Get all pickers
     cursor.execute('SELECT id, picker_id FROM users WHERE role = "picker"')
     pickers = cursor.fetchall()
     
     print(f"Updating passwords for {len(pickers)} pickers...")
     
-    updated = 0
-    for user_id, picker_id in pickers:
-        # Password = picker_id (same case)
-        new_password_hash = generate_password_hash(picker_id)
-        cursor.execute('UPDATE users SET password = ?, password_changed = 0 WHERE id = ?', 
-                      (new_password_hash, user_id))
-        updated += 1
-    
+    # Password = picker_id (same case). PBKDF2 is pure CPU, so hash across
+    # all cores first, then apply everything in one batched statement
+    with ProcessPoolExecutor() as executor:
+        hashes = list(executor.map(_bulk_password_hash,
+                                   [picker_id for _, picker_id in pickers],
+                                   chunksize=64))
+
+    cursor.execute('BEGIN IMMEDIATE')
+    cursor.executemany('UPDATE users SET password = ?, password_changed = 0 WHERE id = ?',
+                       [(password_hash, user_id)
+                        for (user_id, _), password_hash in zip(pickers, hashes)])
     conn.commit()
     conn.close()
+
+    updated = len(pickers)
     
     print(f"✅ Updated {updated} picker passwords")
     print("\nLogin credentials:")
@@ -5,8 +5,11 @@ This runs as part of the build process.
 """
 
 import os
+import io
+import csv
 import json
 import sys
+import hashlib
 
 print("=" * 60)
 print("🚀 PICKER UPLOAD SCRIPT STARTED")
@@ -21,7 +24,6 @@ print(f"✅ DATABASE_URL found")
 
 try:
     import psycopg2
-    from psycopg2.extras import execute_values
     print("✅ Dependencies imported")
 except ImportError as e:
     print(f"❌ Missing dependencies: {e}")
@@ -33,6 +35,14 @@ if DATABASE_URL.startswith('postgres://'):
 
 PICKERS_JSON = 'data_to_upload/pickers_with_hashes.json'
 
+def _content_hash(path):
+    """SHA-256 of a file's bytes - the redeploy change detector"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def upload_pickers():
     if not os.path.exists(PICKERS_JSON):
         print(f"❌ Pre-computed pickers file not found: {PICKERS_JSON}")
@@ -40,8 +50,8 @@ def upload_pickers():
     
     print(f"✅ Found pre-computed pickers file")
     
-    # Load pre-computed data
-    with open(PICKERS_JSON, 'r') as f:
+    # Load pre-computed data (1 MiB buffer - the hash file is a few MB)
+    with open(PICKERS_JSON, 'r', buffering=1 << 20) as f:
         pickers = json.load(f)
     
     print(f"📊 Loaded {len(pickers)} pickers with pre-computed hashes")
@@ -55,26 +65,40 @@ def upload_pickers():
         print(f"❌ Database connection failed: {e}")
         return
     
-    # Ensure columns exist
+    # Ensure columns exist - one ALTER, so the ACCESS EXCLUSIVE lock on
+    # users is taken (and the catalog written) once instead of twice
     try:
-        cursor.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS name TEXT")
-        cursor.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS doj DATE")
+        cursor.execute("""
+            ALTER TABLE users
+                ADD COLUMN IF NOT EXISTS name TEXT,
+                ADD COLUMN IF NOT EXISTS doj DATE
+        """)
         conn.commit()
         print("✅ Schema updated")
     except Exception as e:
         print(f"   Schema note: {e}")
         conn.rollback()
-    
-    # Delete ALL existing pickers
-    cursor.execute("DELETE FROM users WHERE role = 'picker'")
-    deleted = cursor.rowcount
+
+    # Most redeploys ship the same roster - skip the whole upsert when the
+    # file's content hash matches the last successful upload
+    file_hash = _content_hash(PICKERS_JSON)
+    cursor.execute('CREATE TABLE IF NOT EXISTS deploy_state (key TEXT PRIMARY KEY, value TEXT)')
     conn.commit()
-    print(f"🗑️  Deleted {deleted} existing pickers")
-    
-    # Insert all pickers using batch insert (much faster)
-    print("📤 Inserting pickers...")
-    
-    # Prepare data for batch insert
+    cursor.execute('SELECT value FROM deploy_state WHERE key = %s', (PICKERS_JSON,))
+    row = cursor.fetchone()
+    if row and row[0] == file_hash:
+        print(f"⏭️  {PICKERS_JSON} unchanged since last deploy, skipping upload")
+        conn.close()
+        return
+
+    # Upsert instead of the old delete-everything-and-reload: unchanged
+    # rows touch no heap pages, indexes aren't churned by N deletes plus N
+    # inserts per deploy, and pickers dropped from the roster are soft-
+    # flagged rather than destroyed. COPY into a temp table keeps the
+    # bulk-load fast path.
+    print("📤 Upserting pickers...")
+
+    # Prepare data for the bulk load
     values = []
     for p in pickers:
         values.append((
@@ -86,20 +110,67 @@ def upload_pickers():
             p['doj'],
             0  # password_changed
         ))
-    
-    # Batch insert
+
     try:
-        execute_values(
-            cursor,
-            """
+        # Whole load is one transaction ending in one commit; with
+        # synchronous_commit off for just this transaction the commit
+        # doesn't wait on the WAL fsync. Worst case on a crash is a lost
+        # roster load, which the next deploy simply re-runs.
+        cursor.execute("SET LOCAL synchronous_commit = off")
+
+        cursor.execute("""
+            CREATE TEMP TABLE tmp_pickers (
+                picker_id TEXT PRIMARY KEY,
+                password TEXT,
+                role TEXT,
+                name TEXT,
+                cohort INTEGER,
+                doj DATE,
+                password_changed INTEGER
+            ) ON COMMIT DROP
+        """)
+
+        buf = io.StringIO()
+        csv.writer(buf).writerows(values)
+        buf.seek(0)
+        cursor.copy_expert("""
+            COPY tmp_pickers (picker_id, password, role, name, cohort, doj, password_changed)
+            FROM STDIN WITH (FORMAT CSV, NULL '')
+        """, buf)
+
+        # Same full-reset semantics as the old reload: roster rows win,
+        # including the default password and forced change on next login
+        cursor.execute("""
             INSERT INTO users (picker_id, password, role, name, cohort, doj, password_changed)
-            VALUES %s
-            """,
-            values,
-            page_size=100
-        )
+            SELECT picker_id, password, role, name, cohort, doj, password_changed
+            FROM tmp_pickers
+            ON CONFLICT (picker_id) DO UPDATE SET
+                password = EXCLUDED.password,
+                role = EXCLUDED.role,
+                name = EXCLUDED.name,
+                cohort = EXCLUDED.cohort,
+                doj = EXCLUDED.doj,
+                password_changed = EXCLUDED.password_changed
+        """)
+
+        # Pickers no longer on the roster stop ranking but keep their rows
+        cursor.execute("""
+            UPDATE users SET role = 'picker_inactive'
+            WHERE role = 'picker'
+              AND NOT EXISTS (SELECT 1 FROM tmp_pickers t WHERE t.picker_id = users.picker_id)
+        """)
+        deactivated = cursor.rowcount
+
+        # Remember what we loaded so an identical redeploy can skip; rolled
+        # back with the rest if the upsert fails
+        cursor.execute("""
+            INSERT INTO deploy_state (key, value) VALUES (%s, %s)
+            ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+        """, (PICKERS_JSON, file_hash))
+
         conn.commit()
-        print(f"✅ Inserted {len(values)} pickers")
+        print(f"✅ Upserted {len(values)} pickers" +
+              (f", deactivated {deactivated}" if deactivated else ""))
     except Exception as e:
         print(f"❌ Insert error: {e}")
         conn.rollback()